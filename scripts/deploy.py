@@ -1,17 +1,26 @@
+import importlib.util
 import os
+import shlex
 import subprocess
+import sys
 from datetime import datetime
 
-def run(cmd, cwd=None):
-    print(f"> {cmd}")
-    result = subprocess.run(cmd, shell=True, cwd=cwd)
+def run(argv, cwd=None, env=None):
+    # list argv, no shell: saves a /bin/sh fork per command and avoids quoting bugs
+    if isinstance(argv, str):
+        argv = shlex.split(argv)
+    print("> " + " ".join(argv))
+    result = subprocess.run(argv, cwd=cwd, env=env)
     if result.returncode != 0:
-        raise SystemExit(f"❌ Command failed: {cmd}")
-try:
-    import dotenv 
-except ImportError:
-    os.subprocess.run("pip install python-dotenv", shell=True)
-    import dotenv
+        raise SystemExit(f"❌ Command failed: {' '.join(argv)}")
+
+def git(*args, cwd=None, env=None):
+    run(["git", *args], cwd=cwd, env=env)
+# One-time bootstrap: normal runs never spawn pip (and the old
+# os.subprocess.run call here could only ever raise AttributeError)
+if importlib.util.find_spec("dotenv") is None:
+    run([sys.executable, "-m", "pip", "install", "python-dotenv"])
+import dotenv
 
 dotenv.load_dotenv()
 
@@ -28,17 +37,17 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 # 1. Commit any changes in main project to prevent checkout errors
 print("💾 Committing local changes in the main project directory...")
-run("git add .", cwd=PROJECT_ROOT)
+git("add", ".", cwd=PROJECT_ROOT)
 try:
     date_time_stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    run(f'git commit -m "chore: save local changes before deploy {date_time_stamp}"', cwd=PROJECT_ROOT)
+    git("commit", "-m", f"chore: save local changes before deploy {date_time_stamp}", cwd=PROJECT_ROOT)
 except SystemExit:
     # No changes to commit; safe to continue
     print("No local changes to commit.")
 
 # 2. Build the Hugo site
 print("🚀 Building Hugo site...")
-run("hugo --minify", cwd=PROJECT_ROOT)
+run(["hugo", "--minify"], cwd=PROJECT_ROOT)
 
 # 3. In public/, init git if missing and push to gh-pages branch
 print(f"📁 Deploying contents of {PUBLIC_DIR} to branch {TARGET_BRANCH}...")
@@ -47,24 +56,43 @@ public_path = os.path.join(PROJECT_ROOT, PUBLIC_DIR)
 
 if not os.path.exists(os.path.join(public_path, ".git")):
     print("Initializing git repo in public/ folder...")
-    run("git init", cwd=public_path)
-    run(f"git remote add origin {REPO_URL}", cwd=public_path)
+    git("init", cwd=public_path)
+    git("remote", "add", "origin", REPO_URL, cwd=public_path)
 else:
     print("Git repo already exists in public/.")
 
+# Pack/repo tuning for a throwaway publish repo: all cores for packing,
+# fast (light) compression, and the many-files layout optimizations.
+for key, value in (("pack.threads", "0"),
+                   ("pack.windowMemory", "256m"),
+                   ("core.compression", "1"),
+                   ("feature.manyFiles", "true")):
+    git("config", key, value, cwd=public_path)
+
+# Shallow blob-less fetch of the remote tip so the push only sends deltas
+# (and so --force-with-lease below has a remote ref to compare against).
+try:
+    git("fetch", "--depth=1", "--filter=blob:none", "origin", TARGET_BRANCH, cwd=public_path)
+except SystemExit:
+    # First deploy: remote branch doesn't exist yet
+    print(f"No remote {TARGET_BRANCH} branch yet; pushing fresh.")
+
 # Switch to (or create) the gh-pages branch
-run(f"git checkout -B {TARGET_BRANCH}", cwd=public_path)
+git("checkout", "-B", TARGET_BRANCH, cwd=public_path)
 
 # Add all files and commit changes
-run("git add .", cwd=public_path)
+git("add", ".", cwd=public_path)
 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 try:
-    run(f'git commit -m "🚀 Deploy Pictures [{timestamp}]"', cwd=public_path)
+    git("commit", "-m", f"🚀 Deploy Pictures [{timestamp}]", cwd=public_path)
 except SystemExit:
     # No changes to commit; safe to continue
     print("No changes to commit in public/.")
 
-# Force push the gh-pages branch to origin
-run(f"git push -f origin {TARGET_BRANCH}", cwd=public_path)
+# Force push the gh-pages branch to origin; fail fast on a stalled connection.
+# --force-with-lease refuses to clobber a remote tip we haven't seen (the
+# fetch above keeps the lease fresh).
+push_env = dict(os.environ, GIT_HTTP_LOW_SPEED_LIMIT="1000", GIT_HTTP_LOW_SPEED_TIME="60")
+git("push", "--force-with-lease", "origin", TARGET_BRANCH, cwd=public_path, env=push_env)
 
 print("✅ Deployment successful!")
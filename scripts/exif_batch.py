@@ -0,0 +1,91 @@
+"""
+Batch EXIF reader backed by a single persistent exiftool process.
+
+Spawning exiftool once per image pays its startup cost N times; the
+`-stay_open` protocol keeps one daemon alive and streams filenames through
+it, so large directories are read at bulk-parse speed. Used by gen_index.py
+when exiftool is on PATH and the directory is big enough to amortize the
+daemon startup.
+"""
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# -n prints GPS as signed decimal degrees, no DMS conversion needed
+EXIFTOOL_ARGS = ["-j", "-n", "-DateTimeOriginal", "-GPSLatitude", "-GPSLongitude"]
+# EXIF datetime format: "YYYY:MM:DD HH:MM:SS"
+EXIF_DT_RE = re.compile(r"(\d{4}):(\d{2}):(\d{2})")
+
+def available() -> bool:
+    return shutil.which("exiftool") is not None
+
+class ExifToolProcess:
+    """One `exiftool -stay_open True` daemon; feed files, read JSON blocks."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, img_path: Path) -> dict:
+        """Returns exiftool's JSON record for one file ({} on parse trouble)."""
+        cmd = "\n".join(EXIFTOOL_ARGS + [str(img_path), "-execute"]) + "\n"
+        self.proc.stdin.write(cmd.encode("utf-8"))
+        self.proc.stdin.flush()
+        out = []
+        while True:
+            line = self.proc.stdout.readline()
+            if not line or line.strip() == b"{ready}":
+                break
+            out.append(line)
+        try:
+            records = json.loads(b"".join(out))
+            return records[0] if records else {}
+        except Exception:
+            return {}
+
+    def close(self):
+        try:
+            self.proc.stdin.write(b"-stay_open\nFalse\n")
+            self.proc.stdin.flush()
+            self.proc.communicate(timeout=10)
+        except Exception:
+            self.proc.kill()
+
+def record_to_meta(rec: dict) -> Tuple[str, str]:
+    """Maps one exiftool JSON record to the (date_str, loc_str) pair gen_index uses."""
+    date_str = ""
+    loc_str = ""
+    raw = rec.get("DateTimeOriginal")
+    if isinstance(raw, str):
+        m = EXIF_DT_RE.match(raw)
+        if m:
+            date_str = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
+    lat = rec.get("GPSLatitude")
+    lon = rec.get("GPSLongitude")
+    if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+        loc_str = f"{lat:.6f},{lon:.6f}"
+    return date_str, loc_str
+
+def extract_batch(img_paths: List[Path]) -> Dict[str, Tuple[str, str]]:
+    """
+    Reads EXIF for all paths through one exiftool daemon.
+    Returns {filename: (date_str, loc_str)}.
+    """
+    results: Dict[str, Tuple[str, str]] = {}
+    with ExifToolProcess() as et:
+        for p in img_paths:
+            results[p.name] = record_to_meta(et.get(p))
+    return results
@@ -12,25 +12,69 @@ Generate or update a Hugo-style index.md front matter for a photo directory.
 - Marks the first image as `params: {cover: true}` if no cover is already present.
 """
 import argparse
+import hashlib
+import json
+import mmap
 import os
 import sys
 import re
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
 try:
-    from PIL import Image, ExifTags
+    from PIL import Image
 except Exception as e:
     Image = None
-    ExifTags = None
 try:
     import yaml
+    try:
+        # libyaml-backed classes: 5-10x faster parse/emit, drop-in compatible
+        from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 except Exception as e:
     yaml = None
+    YamlLoader = YamlDumper = None
+try:
+    import piexif
+except Exception as e:
+    piexif = None
+try:
+    import exifread
+except Exception as e:
+    exifread = None
+try:
+    import exif_batch
+except Exception as e:
+    exif_batch = None
 
 FRONT_MATTER_DELIM = '---'
-IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG'}
+# matched case-insensitively against the lowercased extension
+IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png'})
+EXIF_CACHE_NAME = '.exif_cache.json'
+# below this many images, exiftool daemon startup outweighs the batch win
+EXIFTOOL_BATCH_MIN = 20
+# EXIF tag IDs indexed directly, so no per-image tag-name mapping is built
+TAG_DATETIME_ORIGINAL = 36867
+TAG_DATETIME_DIGITIZED = 36868
+TAG_DATETIME = 306
+TAG_ORIENTATION = 274
+TAG_EXIF_IFD = 34665
+TAG_GPSINFO = 34853
+GPS_LATITUDE_REF = 1
+GPS_LATITUDE = 2
+GPS_LONGITUDE_REF = 3
+GPS_LONGITUDE = 4
+# EXIF datetime format: "YYYY:MM:DD HH:MM:SS"
+EXIF_DT_RE = re.compile(r"(\d{4}):(\d{2}):(\d{2})")
+
+def exif_date_str(raw: str) -> str:
+    """'YYYY:MM:DD HH:MM:SS' -> 'YYYY-MM-DD', or '' when it doesn't match."""
+    m = EXIF_DT_RE.match(raw)
+    return f"{m.group(1)}-{m.group(2)}-{m.group(3)}" if m else ""
 
 def die(msg: str, code: int = 1):
     print(f"[Error] {msg}", file=sys.stderr)
@@ -38,7 +82,10 @@ def die(msg: str, code: int = 1):
 
 def parse_args():
     p = argparse.ArgumentParser(description="Build or update index.md for a photo directory.")
-    p.add_argument("directory", help="Path to the directory containing images and/or index.md")
+    p.add_argument("directory", nargs="?", default=None,
+                   help="Path to the directory containing images and/or index.md")
+    p.add_argument("--batch", default=None, metavar="ROOT",
+                   help="Process every subdirectory of ROOT as an album (one process per album)")
     p.add_argument("--common-tags", default="", help="Comma-separated list of tags to apply to all images")
     p.add_argument("--default-location", default="", help="Fallback location (string) when location metadata is absent")
     p.add_argument("--page-title", default=None, help="Title to use when creating a new index.md (defaults to directory name)")
@@ -46,6 +93,12 @@ def parse_args():
     p.add_argument("--description", default="Photos.", help="Description for new index.md if created")
     p.add_argument("--categories", default="", help='Comma-separated categories for new index.md (e.g. "travel,india,kerala")')
     p.add_argument("--featured", action="store_true", help="If set, add params.featured: true in new index.md")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Number of threads for metadata extraction (default: 2x CPU count; 1 disables threading)")
+    p.add_argument("--no-cache", action="store_true",
+                   help=f"Ignore and don't write the {EXIF_CACHE_NAME} sidecar cache")
+    p.add_argument("--exiftool", choices=["auto", "on", "off"], default="auto",
+                   help=f"Batch-read EXIF via a single exiftool daemon (auto: when on PATH and > {EXIFTOOL_BATCH_MIN} images)")
     p.add_argument("--dry-run", action="store_true", help="Print what would change without writing")
     return p.parse_args()
 
@@ -64,7 +117,7 @@ def split_front_matter(text: str) -> Tuple[str, Dict[str, Any], str]:
             return "", {}, text
         fm_text = "\n".join(lines[1:end_idx])
         rest = "\n".join(lines[end_idx+1:])
-        data = yaml.safe_load(fm_text) if fm_text.strip() else {}
+        data = yaml.load(fm_text, Loader=YamlLoader) if fm_text.strip() else {}
         if data is None:
             data = {}
         return "", data, rest
@@ -74,86 +127,303 @@ def split_front_matter(text: str) -> Tuple[str, Dict[str, Any], str]:
 # def join_front_matter(front: Dict[str, Any]) -> str:
 #     return FRONT_MATTER_DELIM + "\n" + yaml.safe_dump(front, sort_keys=False, allow_unicode=True).strip() + "\n" + FRONT_MATTER_DELIM + "\n"
 
-def join_front_matter(front: Dict[str, Any]) -> str:
-    class NoAliasDumper(yaml.SafeDumper):
+if yaml is not None:
+    class NoAliasDumper(YamlDumper):
         def ignore_aliases(self, data):
             return True
+else:
+    NoAliasDumper = None
+
+def join_front_matter(front: Dict[str, Any]) -> str:
     dumped = yaml.dump(front, Dumper=NoAliasDumper, sort_keys=False, allow_unicode=True)
     return FRONT_MATTER_DELIM + "\n" + dumped.strip() + "\n" + FRONT_MATTER_DELIM + "\n"
 
 def list_images(dir_path: Path) -> List[Path]:
-    return sorted([p for p in dir_path.iterdir() if p.is_file() and p.suffix in IMAGE_EXTS], key=lambda p: p.name)
-
-def exif_to_dict(img) -> Dict[int, Any]:
-    try:
-        exif = img._getexif()  # type: ignore[attr-defined]
-        return exif or {}
-    except Exception:
-        return {}
+    # os.scandir answers is_file() from the dirent where the OS provides it,
+    # so this avoids one stat per entry vs. Path.iterdir + p.is_file()
+    with os.scandir(dir_path) as it:
+        entries = [e for e in it
+                   if e.is_file(follow_symlinks=False) and os.path.splitext(e.name)[1].lower() in IMAGE_EXTS]
+    entries.sort(key=lambda e: e.name)
+    return [Path(e.path) for e in entries]
+
+@dataclass
+class PhotoMetadata:
+    """Everything we (may) want from one look at an image file."""
+    date: str = ""
+    location: str = ""
+    width: int = None
+    height: int = None
+    orientation: int = None
+
+# multiply instead of dividing by 60/3600 in the per-image DMS hot path
+MINUTES_TO_DEG = 1.0 / 60.0
+SECONDS_TO_DEG = 1.0 / 3600.0
 
 def dms_to_deg(value, ref):
     try:
         d = float(value[0][0]) / float(value[0][1])
         m = float(value[1][0]) / float(value[1][1])
         s = float(value[2][0]) / float(value[2][1])
-        deg = d + (m / 60.0) + (s / 3600.0)
+        deg = d + m * MINUTES_TO_DEG + s * SECONDS_TO_DEG
         if ref in ['S', 'W']:
             deg = -deg
         return deg
     except Exception:
         return None
 
-def extract_metadata(img_path: Path) -> Tuple[str, str]:
+def find_app1_exif(buf):
     """
-    Returns (date_str, location_str). If missing, returns ("", "").
-    date_str format: YYYY-MM-DD
-    location_str format: "lat,lon" with up to 6 decimals, if GPS found; else "".
+    Walks JPEG markers from the start of the buffer (bytes or mmap) and
+    returns the APP1 EXIF payload (starting with b"Exif\\x00\\x00") or None.
+    """
+    if buf[:2] != b'\xFF\xD8':
+        return None
+    i = 2
+    n = len(buf)
+    while i + 4 <= n and buf[i] == 0xFF:
+        marker = buf[i + 1]
+        if 0xD0 <= marker <= 0xD9:
+            # standalone markers (RSTn/SOI/EOI) carry no length field
+            i += 2
+            continue
+        if marker == 0xDA:
+            # start of scan: compressed data follows, no EXIF past this point
+            return None
+        seg_len = int.from_bytes(buf[i + 2:i + 4], 'big')
+        if marker == 0xE1 and buf[i + 4:i + 10] == b'Exif\x00\x00':
+            return buf[i + 4:i + 2 + seg_len]
+        i += 2 + seg_len
+    return None
+
+def piexif_to_meta(exif: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Pulls (date_str, loc_str) out of a piexif.load result, touching only the
+    tags we need (no per-image tag-name mapping).
     """
     date_str = ""
     loc_str = ""
+    raw = exif.get("Exif", {}).get(piexif.ExifIFD.DateTimeOriginal) or exif.get("0th", {}).get(piexif.ImageIFD.DateTime)
+    if isinstance(raw, bytes):
+        raw = raw.decode("ascii", "ignore")
+    if isinstance(raw, str):
+        date_str = exif_date_str(raw)
+    gps = exif.get("GPS") or {}
+    lat_ref = gps.get(piexif.GPSIFD.GPSLatitudeRef)
+    lon_ref = gps.get(piexif.GPSIFD.GPSLongitudeRef)
+    if isinstance(lat_ref, bytes):
+        lat_ref = lat_ref.decode("ascii", "ignore")
+    if isinstance(lon_ref, bytes):
+        lon_ref = lon_ref.decode("ascii", "ignore")
+    lat = lon = None
+    if piexif.GPSIFD.GPSLatitude in gps and lat_ref:
+        lat = dms_to_deg(gps[piexif.GPSIFD.GPSLatitude], lat_ref)
+    if piexif.GPSIFD.GPSLongitude in gps and lon_ref:
+        lon = dms_to_deg(gps[piexif.GPSIFD.GPSLongitude], lon_ref)
+    if lat is not None and lon is not None:
+        loc_str = f"{lat:.6f},{lon:.6f}"
+    return date_str, loc_str
+
+def find_png_exif(buf):
+    """
+    Walks PNG chunks (bytes or mmap) and returns the eXIf chunk payload
+    (a raw TIFF block) or None.
+    """
+    if buf[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    i = 8
+    n = len(buf)
+    while i + 8 <= n:
+        length = int.from_bytes(buf[i:i + 4], 'big')
+        ctype = buf[i + 4:i + 8]
+        if ctype == b'eXIf':
+            return buf[i + 8:i + 8 + length]
+        if ctype in (b'IDAT', b'IEND'):
+            return None
+        i += 12 + length  # length + type + data + crc
+    return None
+
+def extract_exif_app1(img_path: Path):
+    """
+    Fast path: mmap the file (zero-copy, only the touched pages are read),
+    walk JPEG markers to the APP1 EXIF payload - or PNG chunks to an eXIf
+    chunk - and parse just that slice with piexif. Returns (date_str,
+    loc_str), or None when nothing scannable is found (caller falls back).
+    """
+    if piexif is None:
+        return None
+    seg = None
+    try:
+        with open(img_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                seg = find_app1_exif(mm)
+                if seg is None:
+                    tiff = find_png_exif(mm)
+                    if tiff is not None:
+                        seg = b'Exif\x00\x00' + tiff
+    except (OSError, ValueError):
+        # unreadable or empty file; let the other parsers try
+        return None
+    if seg is None:
+        return None
+    try:
+        exif = piexif.load(seg)
+    except Exception:
+        return None
+    return piexif_to_meta(exif)
+
+def extract_exif_exifread(img_path: Path):
+    """
+    exifread-based parse with details=False (no thumbnails/MakerNotes) and a
+    stop_tag so the walk bails once the last needed GPS tag is seen.
+    Returns (date_str, loc_str) or None.
+    """
+    if exifread is None:
+        return None
+    try:
+        with open(img_path, 'rb') as f:
+            tags = exifread.process_file(f, details=False, stop_tag='GPS GPSLongitude', strict=False)
+    except Exception:
+        return None
+    if not tags:
+        return None
+    date_str = ""
+    loc_str = ""
+    for k in ("EXIF DateTimeOriginal", "EXIF DateTimeDigitized", "Image DateTime"):
+        raw = tags.get(k)
+        if raw is not None:
+            date_str = exif_date_str(str(raw))
+            if date_str:
+                break
+    lat = lon = None
+    if "GPS GPSLatitude" in tags and "GPS GPSLatitudeRef" in tags:
+        lat = ratios_to_deg(tags["GPS GPSLatitude"].values, str(tags["GPS GPSLatitudeRef"].values))
+    if "GPS GPSLongitude" in tags and "GPS GPSLongitudeRef" in tags:
+        lon = ratios_to_deg(tags["GPS GPSLongitude"].values, str(tags["GPS GPSLongitudeRef"].values))
+    if lat is not None and lon is not None:
+        loc_str = f"{lat:.6f},{lon:.6f}"
+    return date_str, loc_str
+
+def extract_exif_piexif(img_path: Path):
+    """
+    Full-file piexif parse, for images the APP1 scanner couldn't handle
+    (e.g. TIFF-based files). Returns (date_str, loc_str) or None.
+    """
+    if piexif is None:
+        return None
+    try:
+        exif = piexif.load(str(img_path))
+    except Exception:
+        return None
+    return piexif_to_meta(exif)
+
+def ratios_to_deg(values, ref):
+    """Like dms_to_deg, but for exifread's list of Ratio values."""
+    try:
+        d, m, s = (float(v) for v in values[:3])
+        deg = d + m * MINUTES_TO_DEG + s * SECONDS_TO_DEG
+        if ref in ['S', 'W']:
+            deg = -deg
+        return deg
+    except Exception:
+        return None
+
+def extract_metadata_pillow(img_path: Path) -> PhotoMetadata:
+    """
+    Slow path: one Pillow open per image, gathering every field we may want
+    (date, GPS, dimensions, orientation) so the file is never reopened.
+    """
+    meta = PhotoMetadata()
     if Image is None:
-        return date_str, loc_str
+        return meta
     try:
         with Image.open(img_path) as im:
-            exif = exif_to_dict(im)
-            if exif and ExifTags is not None:
-                tag_map = {ExifTags.TAGS.get(k, k): v for k, v in exif.items()}
-                # DateTimeOriginal
-                for k in ("DateTimeOriginal", "DateTime", "CreateDate"):
-                    if k in tag_map and isinstance(tag_map[k], str):
-                        # EXIF datetime format: "YYYY:MM:DD HH:MM:SS"
-                        m = re.match(r"(\d{4}):(\d{2}):(\d{2})", tag_map[k])
-                        if m:
-                            date_str = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
-                            break
-                # GPS
-                if "GPSInfo" in tag_map:
-                    gps = tag_map["GPSInfo"]
-                    gps_tag_map = {}
-                    if isinstance(gps, dict):
-                        gps_tag_map = {ExifTags.GPSTAGS.get(k, k): v for k, v in gps.items()}
-                    lat = lon = None
-                    if "GPSLatitude" in gps_tag_map and "GPSLatitudeRef" in gps_tag_map:
-                        lat = dms_to_deg(gps_tag_map["GPSLatitude"], gps_tag_map["GPSLatitudeRef"])
-                    if "GPSLongitude" in gps_tag_map and "GPSLongitudeRef" in gps_tag_map:
-                        lon = dms_to_deg(gps_tag_map["GPSLongitude"], gps_tag_map["GPSLongitudeRef"])
-                    if lat is not None and lon is not None:
-                        loc_str = f"{lat:.6f},{lon:.6f}"
-            # Fall back to file modified time for date
-            if not date_str:
-                ts = img_path.stat().st_mtime
-                date_str = dt.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+            meta.width, meta.height = im.size
+            exif = im.getexif()
+            sub = exif.get_ifd(TAG_EXIF_IFD)
+            meta.orientation = exif.get(TAG_ORIENTATION)
+            # DateTimeOriginal / DateTimeDigitized / DateTime
+            raw = sub.get(TAG_DATETIME_ORIGINAL) or sub.get(TAG_DATETIME_DIGITIZED) or exif.get(TAG_DATETIME)
+            if isinstance(raw, str):
+                meta.date = exif_date_str(raw)
+            # GPS
+            gps = exif.get_ifd(TAG_GPSINFO)
+            lat = lon = None
+            if GPS_LATITUDE in gps and GPS_LATITUDE_REF in gps:
+                lat = ratios_to_deg(gps[GPS_LATITUDE], gps[GPS_LATITUDE_REF])
+            if GPS_LONGITUDE in gps and GPS_LONGITUDE_REF in gps:
+                lon = ratios_to_deg(gps[GPS_LONGITUDE], gps[GPS_LONGITUDE_REF])
+            if lat is not None and lon is not None:
+                meta.location = f"{lat:.6f},{lon:.6f}"
     except Exception:
-        # ignore failures, keep empty loc/date if not set
+        # ignore failures, keep empty fields
+        pass
+    return meta
+
+def extract_metadata(img_path: Path, st: os.stat_result = None) -> PhotoMetadata:
+    """
+    Returns a PhotoMetadata; fields default to "" / None when not found.
+    date format: YYYY-MM-DD; location format: "lat,lon" with up to 6 decimals.
+    Pass `st` when the caller already stat'ed the file to avoid a second stat.
+    """
+    # Cheapest parser first: APP1 slice, then exifread with early stop, then
+    # full-file piexif, then Pillow (only reached when neither is installed).
+    pair = (extract_exif_app1(img_path)
+            or extract_exif_exifread(img_path)
+            or extract_exif_piexif(img_path))
+    if pair is not None:
+        meta = PhotoMetadata(date=pair[0], location=pair[1])
+    else:
+        meta = extract_metadata_pillow(img_path)
+    # Fall back to file modified time for date
+    if not meta.date:
         try:
-            ts = img_path.stat().st_mtime
-            date_str = dt.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+            ts = st.st_mtime if st is not None else img_path.stat().st_mtime
+            meta.date = dt.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
         except Exception:
             pass
-    return date_str, loc_str
+    return meta
 
-def build_resource_for_image(img_path: Path, common_tags: List[str], default_location: str) -> Dict[str, Any]:
-    date_str, loc_str = extract_metadata(img_path)
+def load_exif_cache(dir_path: Path) -> Dict[str, Any]:
+    """Loads the sidecar EXIF cache for a directory; empty dict if missing/corrupt."""
+    try:
+        with open(dir_path / EXIF_CACHE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def save_exif_cache(dir_path: Path, cache: Dict[str, Any]):
+    """Writes the cache atomically (tmp file + rename) so a crash can't corrupt it."""
+    cache_path = dir_path / EXIF_CACHE_NAME
+    tmp_path = cache_path.with_name(EXIF_CACHE_NAME + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        tmp_path.rename(cache_path)
+    except Exception as e:
+        print(f"[WARN] Could not write {cache_path}: {e}", file=sys.stderr)
+
+def build_resource_for_image(img_path: Path, common_tags: List[str], default_location: str,
+                             cache: Dict[str, Any] = None,
+                             batch_meta: Dict[str, Tuple[str, str]] = None) -> Dict[str, Any]:
+    st = img_path.stat()
+    # cache key: a stale entry is detected by size or mtime change
+    key = [img_path.name, st.st_size, int(st.st_mtime)]
+    cached = cache.get(img_path.name) if cache is not None else None
+    if cached and cached.get("key") == key:
+        date_str = cached.get("date", "")
+        loc_str = cached.get("loc", "")
+    else:
+        if batch_meta is not None and img_path.name in batch_meta:
+            date_str, loc_str = batch_meta[img_path.name]
+            if not date_str:
+                date_str = dt.datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d")
+        else:
+            meta = extract_metadata(img_path, st)
+            date_str, loc_str = meta.date, meta.location
+        if cache is not None:
+            cache[img_path.name] = {"key": key, "date": date_str, "loc": loc_str}
     location_val = loc_str if loc_str else default_location
     title = img_path.stem
     params = {"date": date_str}
@@ -169,17 +439,6 @@ def build_resource_for_image(img_path: Path, common_tags: List[str], default_loc
     }
     return resource
 
-def ensure_cover(resources: List[Dict[str, Any]]):
-    # If none has cover true, set the first to have cover: true (but don't overwrite existing params)
-    any_cover = False
-    for r in resources:
-        if isinstance(r.get("params"), dict) and r["params"].get("cover") is True:
-            any_cover = True
-            break
-    if not any_cover and resources:
-        resources[0].setdefault("params", {})
-        resources[0]["params"]["cover"] = True
-
 def resources_to_dict(resources: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     return {r.get("src"): r for r in resources if isinstance(r, dict) and r.get("src")}
 
@@ -188,42 +447,19 @@ def update_weights(sorted_resources: List[Dict[str, Any]]):
         r.setdefault("params", {})
         r["params"]["weight"] = idx
 
-def update_weights_preserve_existing(sorted_resources: list, previous_by_src: dict):
-    """
-    Keep existing weights exactly as they are.
-    For resources without a weight (i.e., new images), assign weights
-    starting from (max existing weight + 1) in filename order.
-    """
-    # Collect existing weights
-    existing_weights = {}
-    for src, r in previous_by_src.items():
+def max_existing_weight(previous_by_src: dict) -> int:
+    """Highest valid integer weight among existing resources (0 if none)."""
+    max_w = 0
+    for r in previous_by_src.values():
         try:
             w = int(r.get("params", {}).get("weight"))
-            existing_weights[src] = w
         except (TypeError, ValueError):
-            pass
-
-    max_w = max(existing_weights.values(), default=0)
-
-    # First pass: ensure params dict exists
-    for r in sorted_resources:
-        r.setdefault("params", {})
-
-    # Second pass: assign only to ones missing weight
-    next_w = max_w + 1
-    for r in sorted_resources:
-        if "weight" not in r["params"] or r["params"]["weight"] in (None, ""):
-            r["params"]["weight"] = next_w
-            next_w += 1
-
-def main():
-    args = parse_args()
-    if yaml is None:
-        die("PyYAML is required. Install with: pip install pyyaml")
-    dir_path = Path(args.directory).resolve()
-    if not dir_path.exists() or not dir_path.is_dir():
-        die(f"Directory not found: {dir_path}")
+            continue
+        if w > max_w:
+            max_w = w
+    return max_w
 
+def process_directory(dir_path: Path, args):
     index_path = dir_path / "index.md"
     images = list_images(dir_path)
     common_tags = [t.strip() for t in args.common_tags.split(",") if t.strip()]
@@ -233,9 +469,11 @@ def main():
     
     front: Dict[str, Any] = {}
     trailing_body = ""
+    original_text = None
 
     if index_path.exists():
         text = index_path.read_text(encoding="utf-8")
+        original_text = text
         _, front, trailing_body = split_front_matter(text)
         if not isinstance(front, dict):
             front = {}
@@ -259,17 +497,55 @@ def main():
     existing_resources = front.get("resources", [])
     existing_by_src = resources_to_dict(existing_resources) if isinstance(existing_resources, list) else {}
 
-    # Build desired set from filesystem
+    # Build desired set from filesystem.
+    # EXIF extraction is I/O-bound (one file read per image), so overlap the
+    # reads with a thread pool instead of looping serially.
+    workers = args.workers or (os.cpu_count() or 1) * 2
+    cache = {} if args.no_cache else load_exif_cache(dir_path)
+
+    # Large directories: stream every file through one exiftool daemon
+    # instead of parsing per-file in Python.
+    batch_meta = None
+    use_exiftool = (args.exiftool == "on"
+                    or (args.exiftool == "auto" and len(images) > EXIFTOOL_BATCH_MIN))
+    if use_exiftool and exif_batch is not None and exif_batch.available():
+        # only feed the daemon files the sidecar cache can't answer
+        pending = []
+        for p in images:
+            st = p.stat()
+            c = cache.get(p.name)
+            if not (c and c.get("key") == [p.name, st.st_size, int(st.st_mtime)]):
+                pending.append(p)
+        if pending:
+            try:
+                batch_meta = exif_batch.extract_batch(pending)
+            except Exception as e:
+                print(f"[WARN] exiftool batch read failed ({e}); using per-file parser", file=sys.stderr)
+                batch_meta = None
+
     desired_by_src: Dict[str, Dict[str, Any]] = {}
-    for img in images:
-        desired_by_src[img.name] = build_resource_for_image(img, common_tags, args.default_location)
+    if workers > 1 and len(images) > 1 and batch_meta is None:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = ex.map(lambda p: (p.name, build_resource_for_image(p, common_tags, args.default_location, cache)), images)
+            desired_by_src = dict(results)
+    else:
+        for img in images:
+            desired_by_src[img.name] = build_resource_for_image(img, common_tags, args.default_location, cache, batch_meta)
+
+    # Drop cache entries for images that no longer exist
+    cache = {name: entry for name, entry in cache.items() if name in desired_by_src}
 
     # Merge strategy:
     # - Add new images from desired_by_src that are not in existing_by_src
     # - For images present in both, we keep existing entries BUT we update date/location/tags if missing there
     #   and always ensure title = filename stem.
     # - Remove entries whose src no longer exists on disk.
+    # Keep existing weights exactly as they are; new images (or entries with
+    # a missing weight) are numbered inline from (max existing weight + 1)
+    # in filename order, so no separate weight pass over merged is needed.
+    next_w = max_existing_weight(existing_by_src) + 1
     merged: List[Dict[str, Any]] = []
+    any_cover = False
     for src in sorted(desired_by_src.keys()):
         if src in existing_by_src:
             r = existing_by_src[src]
@@ -281,22 +557,35 @@ def main():
                     val = desired_by_src[src]["params"].get(key)
                     if val not in (None, "", []):
                         r["params"][key] = val
-            merged.append(r)
         else:
-            merged.append(desired_by_src[src])
+            r = desired_by_src[src]
+            r.setdefault("params", {})
+        if r["params"].get("weight") in (None, ""):
+            r["params"]["weight"] = next_w
+            next_w += 1
+        any_cover = any_cover or r["params"].get("cover") is True
+        merged.append(r)
 
     # Remove any resources not present on disk (implicitly by rebuilding merged only from desired keys)
 
-    # Update weights based on sorted order by filename
-    # update_weights(merged)
-    update_weights_preserve_existing(merged, existing_by_src)
-
-    # Ensure a cover image is set if none exists
-    ensure_cover(merged)
+    # Ensure a cover image is set if none exists (don't overwrite existing params)
+    if not any_cover and merged:
+        merged[0]["params"]["cover"] = True
 
     # Write back
     front["resources"] = merged
 
+    # Fast path: when the merged resource list hashes the same as last run,
+    # skip the YAML dump and the write entirely (keeps index.md mtime intact
+    # so Hugo's watcher doesn't re-process the page).
+    resources_hash = hashlib.blake2b(json.dumps(merged, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    if not args.dry_run and index_path.exists() and front.get("_resources_hash") == resources_hash:
+        if not args.no_cache:
+            save_exif_cache(dir_path, cache)
+        print(f"[INFO] Unchanged: {index_path}")
+        return
+    front["_resources_hash"] = resources_hash
+
     output_text = join_front_matter(front)
     if trailing_body.strip():
         output_text += trailing_body if output_text.endswith("\n") else "\n" + trailing_body
@@ -306,13 +595,56 @@ def main():
         print(output_text)
         return
 
-    index_path.write_text(output_text, encoding="utf-8")
+    if not args.no_cache:
+        save_exif_cache(dir_path, cache)
+    # Don't touch index.md when the output is byte-identical: rewriting it
+    # only bumps the mtime and makes Hugo re-process an unchanged page.
+    new_bytes = output_text.encode("utf-8")
+    if original_text is not None and original_text.encode("utf-8") == new_bytes:
+        print(f"[INFO] Unchanged: {index_path}")
+        return
+    index_path.write_bytes(new_bytes)
     print(f"[INFO] Updated: {index_path}")
     print(f"[INFO] Images found: {len(images)}")
     if not images:
         print("[Tip] Add images (jpg/jpeg/png) to the directory and run again.")
     print("[INFO] Done.")
 
+def main():
+    args = parse_args()
+    if yaml is None:
+        die("PyYAML is required. Install with: pip install pyyaml")
+
+    if args.batch:
+        # Multi-album mode: one interpreter startup, one process per album,
+        # instead of invoking the script once per directory.
+        root = Path(args.batch).resolve()
+        if not root.exists() or not root.is_dir():
+            die(f"Batch root not found: {root}")
+        albums = sorted((d for d in root.iterdir() if d.is_dir()), key=lambda d: d.name)
+        if not albums:
+            die(f"No album subdirectories under: {root}")
+        failed = 0
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            futures = {ex.submit(process_directory, d, args): d for d in albums}
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"[Error] {futures[fut]}: {e}", file=sys.stderr)
+        print(f"[INFO] Batch done: {len(albums) - failed}/{len(albums)} albums updated.")
+        if failed:
+            sys.exit(1)
+        return
+
+    if not args.directory:
+        die("A directory argument (or --batch ROOT) is required.")
+    dir_path = Path(args.directory).resolve()
+    if not dir_path.exists() or not dir_path.is_dir():
+        die(f"Directory not found: {dir_path}")
+    process_directory(dir_path, args)
+
 if __name__ == "__main__":
     main()
     